@@ -13,204 +13,632 @@ Fixes all remaining issues:
 """
 
 import chess
-import chess.pgn
-import argparse
 import io
+import sys
 from pathlib import Path
-from typing import Optional, Tuple, Dict, List, Set, Any
+from typing import Optional, Tuple, Dict, List, Any
 import time
 import random
-import json
-from multiprocessing import Pool, cpu_count
-from collections import defaultdict
-from enum import Enum
+import struct
+from multiprocessing import RawArray, Value, cpu_count
+
+# Population count: int.bit_count on Python 3.10+, else gmpy2 if installed
+if hasattr(int, "bit_count"):
+    _popcount = int.bit_count
+else:
+    try:
+        from gmpy2 import popcount as _popcount
+    except ImportError:
+        def _popcount(bb: int) -> int:
+            return bin(bb).count("1")
 
 
 # ============================================================================
-# ENUMS AND CONSTANTS
+# CONSTANTS
 # ============================================================================
 
-class TTFlag(Enum):
-    EXACT = 0
-    LOWER = 1
-    UPPER = 2
+# Printed by main() only, so pool workers importing this module never emit it
+BANNER = """
+╔══════════════════════════════════════════════════════════════════╗
+║         CHESS ENGINE v7.2 - PERFECT FINAL                       ║
+║   TT • Tactics • PST • Mobility • Pawns • King Safety • PV      ║
+╚══════════════════════════════════════════════════════════════════╝
+    
+"""
+
+# Transposition table bound flags
+TT_EXACT = 0
+TT_LOWER = 1
+TT_UPPER = 2
+
+
+# Indexed by piece_type (index 0 unused)
+PIECE_LETTERS = ("", "P", "N", "B", "R", "Q", "K")
+PIECE_NAMES = ("", "pawn", "knight", "bishop", "rook", "queen", "king")
+PIECE_VALUES_ARR = (0, 100, 320, 330, 500, 900, 0)
+
+# MVV-LVA capture scores (victim value * 10 - attacker value), indexed by
+# victim_type * 8 + attacker_type
+MVV_LVA = tuple(PIECE_VALUES_ARR[victim] * 10 - PIECE_VALUES_ARR[attacker] if victim < 7 and attacker < 7 else 0
+                for victim in range(8) for attacker in range(8))
+
+NULL_MOVE = chess.Move.null()
 
 
 # ============================================================================
-# TRANSPOSITION TABLE
+# ZOBRIST HASHING
 # ============================================================================
 
-class TranspositionTable:
-    """Optimized transposition table with size management."""
+def _init_zobrist() -> Tuple[List[List[List[int]]], int, List[int], List[int]]:
+    """Initialize Zobrist keys for hashing."""
+    rng = random.Random(0xDEADBEEF)
 
-    def __init__(self, max_size: int = 2000000):
-        self.table: Dict[int, Tuple[int, int, TTFlag, Optional[chess.Move], List[chess.Move]]] = {}
-        self.zobrist_keys = self._init_zobrist()
-        self.max_size = max_size
-
-    def _init_zobrist(self) -> Dict:
-        """Initialize Zobrist keys for hashing."""
-        keys = {}
-        random.seed(0xDEADBEEF)
-
-        # Piece keys
-        for square in chess.SQUARES:
-            for piece_type in chess.PIECE_TYPES:
-                for color in [chess.WHITE, chess.BLACK]:
-                    keys[(square, piece_type, color)] = random.getrandbits(64)
-
-        # Side to move
-        keys['side_to_move'] = random.getrandbits(64)
-
-        # Castling rights - FIXED to use BB_ bitboard constants
-        keys['castling'] = {
-            chess.BB_A1: random.getrandbits(64),  # White queenside (a1 rook)
-            chess.BB_H1: random.getrandbits(64),  # White kingside (h1 rook)
-            chess.BB_A8: random.getrandbits(64),  # Black queenside (a8 rook)
-            chess.BB_H8: random.getrandbits(64)   # Black kingside (h8 rook)
-        }
-
-        # En passant
-        keys['en_passant'] = {}
-        for square in chess.SQUARES:
-            keys['en_passant'][square] = random.getrandbits(64)
-
-        return keys
+    # Piece keys, indexed as [color][piece_type][square] (piece_type 0 unused)
+    piece_keys = [[[rng.getrandbits(64) if piece_type else 0 for _ in chess.SQUARES]
+                   for piece_type in range(7)]
+                  for _ in chess.COLORS]
 
-    def hash_board(self, board: chess.Board) -> int:
-        """Compute Zobrist hash of board position."""
-        h = 0
+    # Side to move
+    side_key = rng.getrandbits(64)
 
-        # Pieces
-        for square in chess.SQUARES:
-            piece = board.piece_at(square)
-            if piece:
-                h ^= self.zobrist_keys[(square, piece.piece_type, piece.color)]
+    # Castling rights: one key per corner rook (a1, h1, a8, h8), combined into
+    # a 16-entry table so a change of rights is a single XOR
+    corner_keys = [rng.getrandbits(64) for _ in range(4)]
+    castling_keys = []
+    for index in range(16):
+        key = 0
+        for bit in range(4):
+            if index & (1 << bit):
+                key ^= corner_keys[bit]
+        castling_keys.append(key)
 
-        # Side to move
-        if board.turn == chess.BLACK:
-            h ^= self.zobrist_keys['side_to_move']
+    # En passant, by file only: the rank follows from the side to move
+    ep_keys = [rng.getrandbits(64) for _ in chess.FILE_NAMES]
+
+    return piece_keys, side_key, castling_keys, ep_keys
+
+
+ZOBRIST_PIECES, ZOBRIST_SIDE, ZOBRIST_CASTLING, ZOBRIST_EP = _init_zobrist()
+
+
+def _castling_index(castling_rights: int) -> int:
+    """Map the a1/h1/a8/h8 castling bits to a 0-15 index."""
+    return ((castling_rights & 1) | ((castling_rights >> 6) & 2) |
+            ((castling_rights >> 54) & 4) | ((castling_rights >> 60) & 8))
+
+
+def _ep_key(board: chess.Board) -> int:
+    """Zobrist key of the en passant file, hashed only when a pawn of the side
+    to move stands ready to capture (as in Polyglot; legality is not checked)."""
+    ep_square = board.ep_square
+    if ep_square is None:
+        return 0
+    if not chess.BB_PAWN_ATTACKS[not board.turn][ep_square] & board.pawns & board.occupied_co[board.turn]:
+        return 0
+    return ZOBRIST_EP[ep_square & 7]
+
+
+def _piece_key(board: chess.Board, square: int) -> int:
+    """Zobrist key of the piece on a square (0 if empty)."""
+    piece_type = board.piece_type_at(square)
+    if not piece_type:
+        return 0
+    color = bool(board.occupied_co[chess.WHITE] & chess.BB_SQUARES[square])
+    return ZOBRIST_PIECES[color][piece_type][square]
+
+
+def zobrist_hash(board: chess.Board) -> int:
+    """Compute Zobrist hash of board position from scratch."""
+    h = 0
+
+    # Pieces, walked per color and piece type straight off the bitboards
+    for color in chess.COLORS:
+        color_keys = ZOBRIST_PIECES[color]
+        for piece_type in chess.PIECE_TYPES:
+            keys = color_keys[piece_type]
+            pieces = board.pieces_mask(piece_type, color)
+            while pieces:
+                h ^= keys[(pieces & -pieces).bit_length() - 1]
+                pieces &= pieces - 1
 
-        # Castling rights
-        for castling_right, key in self.zobrist_keys['castling'].items():
-            if board.has_castling_rights(castling_right):
-                h ^= key
+    # Side to move
+    if board.turn == chess.BLACK:
+        h ^= ZOBRIST_SIDE
 
-        # En passant
-        if board.ep_square is not None:
-            h ^= self.zobrist_keys['en_passant'][board.ep_square]
+    # Castling rights
+    h ^= ZOBRIST_CASTLING[_castling_index(board.castling_rights)]
 
-        return h
+    # En passant
+    h ^= _ep_key(board)
 
-    def probe(self, board: chess.Board, depth: int, alpha: int, beta: int) -> Tuple[bool, int, Optional[chess.Move], List[chess.Move]]:
-        """Probe table for position."""
+    return h
+
+
+# Raw board snapshot: piece bitboards (pawns to kings), white occupancy,
+# promoted pieces, castling rights, turn, en passant square (-1 for none),
+# halfmove clock and fullmove number
+_RAW_BOARD = struct.Struct("<9QBbII")
+
+
+class ZobristBoard(chess.Board):
+    """Board that keeps its Zobrist hash up to date incrementally on push/pop."""
+
+    def clear_stack(self) -> None:
+        # Every python-chess setter (set_fen, reset, set_piece_at, ...) ends here
+        super().clear_stack()
+        self._zobrist_stack: List[int] = []
+        self.zobrist_hash = zobrist_hash(self)
+
+    def push(self, move: chess.Move) -> None:
+        h = self.zobrist_hash
+        self._zobrist_stack.append(h)
+        old_castling = self.castling_rights
+        old_ep = self.ep_square
+        old_ep_key = _ep_key(self)
+
+        if not move:
+            super().push(move)
+        else:
+            from_square = move.from_square
+            to_square = move.to_square
+            turn = self.turn
+            piece_type = self.piece_type_at(from_square)
+            if piece_type == chess.KING and (
+                    abs(to_square - from_square) == 2 or
+                    self.rooks & self.occupied_co[turn] & chess.BB_SQUARES[to_square]):
+                # Castling: rehash the whole back rank
+                squares = tuple(chess.scan_forward(chess.BB_RANKS[from_square >> 3]))
+                for square in squares:
+                    h ^= _piece_key(self, square)
+                super().push(move)
+                for square in squares:
+                    h ^= _piece_key(self, square)
+            else:
+                our_keys = ZOBRIST_PIECES[turn]
+                their_keys = ZOBRIST_PIECES[not turn]
+                h ^= our_keys[piece_type][from_square]
+                captured_type = self.piece_type_at(to_square)
+                if captured_type:
+                    h ^= their_keys[captured_type][to_square]
+                elif piece_type == chess.PAWN and to_square == old_ep:
+                    down = -8 if turn == chess.WHITE else 8
+                    h ^= their_keys[chess.PAWN][to_square + down]
+                super().push(move)
+                h ^= our_keys[move.promotion or piece_type][to_square]
+
+        h ^= ZOBRIST_SIDE
+        if old_castling != self.castling_rights:
+            h ^= (ZOBRIST_CASTLING[_castling_index(old_castling)] ^
+                  ZOBRIST_CASTLING[_castling_index(self.castling_rights)])
+        h ^= old_ep_key ^ _ep_key(self)
+        self.zobrist_hash = h
+
+    def pop(self) -> chess.Move:
+        move = super().pop()
+        self.zobrist_hash = self._zobrist_stack.pop()
+        return move
+
+    def copy(self, *, stack=True) -> "ZobristBoard":
+        board = super().copy(stack=stack)
+        board.zobrist_hash = self.zobrist_hash
+        if stack:
+            stack = len(self.move_stack) if stack is True else stack
+            board._zobrist_stack = self._zobrist_stack[-stack:]
+        return board
+
+    def root(self) -> "ZobristBoard":
+        board = super().root()
+        board.zobrist_hash = zobrist_hash(board)
+        return board
+
+    def apply_transform(self, f) -> None:
+        super().apply_transform(f)
+        self.zobrist_hash = zobrist_hash(self)
+
+    def apply_mirror(self) -> None:
+        super().apply_mirror()
+        self.zobrist_hash = zobrist_hash(self)
+
+    def to_raw(self) -> bytes:
+        """Compact snapshot of the position (no move stack), for from_raw()."""
+        return _RAW_BOARD.pack(self.pawns, self.knights, self.bishops, self.rooks, self.queens, self.kings,
+                               self.occupied_co[chess.WHITE], self.promoted, self.castling_rights,
+                               self.turn, -1 if self.ep_square is None else self.ep_square,
+                               self.halfmove_clock, self.fullmove_number)
+
+    def set_raw(self, raw: bytes) -> None:
+        """Restore a position from to_raw() by assigning the bitboards directly,
+        skipping FEN parsing."""
+        (self.pawns, self.knights, self.bishops, self.rooks, self.queens, self.kings,
+         white, self.promoted, self.castling_rights, turn, ep_square,
+         self.halfmove_clock, self.fullmove_number) = _RAW_BOARD.unpack(raw)
+        self.occupied = self.pawns | self.knights | self.bishops | self.rooks | self.queens | self.kings
+        self.occupied_co[chess.WHITE] = white
+        self.occupied_co[chess.BLACK] = self.occupied & ~white
+        self.turn = bool(turn)
+        self.ep_square = None if ep_square < 0 else ep_square
+        self.clear_stack()
+
+
+# PGN visitor class, built by _pgn_board_builder() on first use
+_PGN_BOARD_BUILDER = None
+
+
+def _pgn_board_builder() -> type:
+    """PGN visitor class that plays the mainline straight onto a ZobristBoard.
+
+    Unlike the default game builder, no GameNode tree is allocated; the
+    mainline ends up on the board's move stack. Like it, an illegal or
+    ambiguous move ends the game there and keeps the moves before it.
+
+    chess.pgn pulls in chess.engine and asyncio, so it is imported here on
+    first use rather than by every spawned pool worker importing this module.
+    """
+    global _PGN_BOARD_BUILDER
+    if _PGN_BOARD_BUILDER is None:
+        import chess.pgn
+
+        class ZobristBoardBuilder(chess.pgn.BaseVisitor):
+            def begin_game(self) -> None:
+                self.headers = chess.pgn.Headers()
+                self.board = None
+
+            def visit_header(self, tagname: str, tagvalue: str) -> None:
+                self.headers[tagname] = tagvalue
+
+            def end_headers(self) -> None:
+                self.board = ZobristBoard(self.headers.get("FEN", chess.STARTING_FEN),
+                                          chess960=self.headers.is_chess960())
+
+            def begin_variation(self):
+                # The parser then skips the variation without calling visit_move
+                return chess.pgn.SKIP
+
+            def visit_move(self, board: chess.Board, move: chess.Move) -> None:
+                self.board.push(move)
+
+            def handle_error(self, error: Exception) -> None:
+                print(f"Warning: {error} while parsing PGN; stopping at the last legal move")
+
+            def result(self) -> Optional[ZobristBoard]:
+                return self.board
+
+        _PGN_BOARD_BUILDER = ZobristBoardBuilder
+    return _PGN_BOARD_BUILDER
+
+
+def read_pgn_board(handle) -> Optional[ZobristBoard]:
+    """Board after the mainline of the next game in a PGN stream, or None."""
+    import chess.pgn
+    return chess.pgn.read_game(handle, Visitor=_pgn_board_builder())
+
+
+# ============================================================================
+# TRANSPOSITION TABLE
+# ============================================================================
+
+class TranspositionTable:
+    """Fixed-size, power-of-two transposition table with depth-preferred replacement."""
+
+    # A new position may evict a different one searched up to this much deeper
+    REPLACE_MARGIN = 2
+
+    def __init__(self, max_size: int = 2000000):
+        size = 1
+        while size * 2 <= max_size:
+            size *= 2
+        self.size = size
+        self.mask = size - 1
+        self.count = 0
+
+        # One column per field, indexed by slot (no per-entry tuples); key 0
+        # marks an empty slot. PVs are recovered with extract_pv().
+        self.keys: List[int] = [0] * size
+        self.depths: List[int] = [0] * size
+        self.scores: List[int] = [0] * size
+        self.flags: List[int] = [0] * size
+        self.moves: List[Optional[chess.Move]] = [None] * size
+
+    def __len__(self) -> int:
+        return self.count
+
+    def hash_board(self, board: chess.Board) -> int:
+        """Return Zobrist hash of board position."""
+        if isinstance(board, ZobristBoard):
+            return board.zobrist_hash
+        return zobrist_hash(board)
+
+    def _read(self, idx: int) -> Tuple[int, int, int, int, Optional[chess.Move]]:
+        """Key, depth, score, flag and best move stored in a slot."""
+        return self.keys[idx], self.depths[idx], self.scores[idx], self.flags[idx], self.moves[idx]
+
+    def _write(self, idx: int, key: int, depth: int, score: int, flag: int, best_move: Optional[chess.Move]):
+        """Overwrite a slot."""
+        self.keys[idx] = key
+        self.depths[idx] = depth
+        self.scores[idx] = score
+        self.flags[idx] = flag
+        self.moves[idx] = best_move
+
+    def probe(self, board: chess.Board, depth: int, alpha: int, beta: int) -> Tuple[int, bool, int, Optional[chess.Move]]:
+        """Probe table for position. Returns the hash key for a later store()."""
         key = self.hash_board(board)
-        if key in self.table:
-            stored_depth, stored_score, flag, stored_move, pv = self.table[key]
+        stored_key, stored_depth, stored_score, flag, stored_move = self._read(key & self.mask)
+        if stored_key == key:
             if stored_depth >= depth:
-                if flag == TTFlag.EXACT:
-                    return True, stored_score, stored_move, pv
-                elif flag == TTFlag.LOWER and stored_score >= beta:
-                    return True, stored_score, stored_move, pv
-                elif flag == TTFlag.UPPER and stored_score <= alpha:
-                    return True, stored_score, stored_move, pv
-        return False, 0, None, []
-
-    def store(self, board: chess.Board, depth: int, score: int, flag: TTFlag, 
-              best_move: Optional[chess.Move], pv: List[chess.Move] = None):
-        """Store position in table with principal variation."""
-        key = self.hash_board(board)
-        if pv is None:
-            pv = []
-
-        # Size limit management
-        if len(self.table) >= self.max_size:
-            # Remove 10% of entries randomly
-            to_remove = random.sample(list(self.table.keys()), len(self.table) // 10)
-            for k in to_remove:
-                del self.table[k]
-
-        # Always replace with deeper entries
-        if key in self.table:
-            old_depth, _, _, _, _ = self.table[key]
-            if depth >= old_depth:
-                self.table[key] = (depth, score, flag, best_move, pv)
+                if flag == TT_EXACT:
+                    return key, True, stored_score, stored_move
+                elif flag == TT_LOWER and stored_score >= beta:
+                    return key, True, stored_score, stored_move
+                elif flag == TT_UPPER and stored_score <= alpha:
+                    return key, True, stored_score, stored_move
+        return key, False, 0, None
+
+    def store(self, key: int, depth: int, score: int, flag: int, best_move: Optional[chess.Move]):
+        """Store position under a key returned by probe()."""
+        idx = key & self.mask
+        stored_key, stored_depth, _, _, _ = self._read(idx)
+        if stored_key:
+            # Same position: only deeper results replace it; different
+            # position: evict unless it was searched much deeper
+            margin = 0 if stored_key == key else self.REPLACE_MARGIN
+            if depth + margin < stored_depth:
+                return
         else:
-            self.table[key] = (depth, score, flag, best_move, pv)
+            self.count += 1
+
+        self._write(idx, key, depth, score, flag, best_move)
+
+    def extract_pv(self, board: chess.Board, max_len: int) -> List[chess.Move]:
+        """Recover a principal variation by following stored best moves from a position."""
+        pv = []
+        try:
+            while len(pv) < max_len:
+                key = self.hash_board(board)
+                stored_key, _, _, _, move = self._read(key & self.mask)
+                if stored_key != key:
+                    break
+                if move is None or not board.is_legal(move):
+                    break
+                pv.append(move)
+                board.push(move)
+        finally:
+            for _ in pv:
+                board.pop()
+        return pv
+
+
+class SharedTranspositionTable(TranspositionTable):
+    """Transposition table in shared memory, used by all worker processes of a search.
+
+    Each slot is a 64-bit key and a 64-bit packed entry. The key is stored
+    XORed with the entry, so a slot torn by two processes writing at once
+    fails the key check instead of returning a mixed entry.
+    """
+
+    def __init__(self, max_size: int = 1 << 20, buffers: Optional[Tuple[Any, Any]] = None):
+        if buffers is None:
+            size = 1
+            while size * 2 <= max_size:
+                size *= 2
+            buffers = (RawArray('Q', size), RawArray('Q', size))
+        self.buffers = buffers
+        self.keys, self.data = buffers
+        self.size = len(self.keys)
+        self.mask = self.size - 1
+        self.count = 0
+
+    def __len__(self) -> int:
+        return sum(1 for data in self.data if data)
+
+    def _read(self, idx: int) -> Tuple[int, int, int, int, Optional[chess.Move]]:
+        data = self.data[idx]
+        if not data:
+            return 0, 0, 0, 0, None
+        # Packed as score (offset by 2^31) << 32 | depth << 24 | flag << 16 | move
+        packed_move = data & 0xFFFF
+        move = None
+        if packed_move:
+            move = chess.Move(packed_move & 63, (packed_move >> 6) & 63, (packed_move >> 12) or None)
+        return self.keys[idx] ^ data, (data >> 24) & 0xFF, (data >> 32) - 0x80000000, (data >> 16) & 0xFF, move
+
+    def _write(self, idx: int, key: int, depth: int, score: int, flag: int, best_move: Optional[chess.Move]):
+        packed_move = 0
+        if best_move:
+            packed_move = (best_move.from_square | (best_move.to_square << 6) |
+                           ((best_move.promotion or 0) << 12))
+        data = ((score + 0x80000000) << 32) | (depth << 24) | (flag << 16) | packed_move
+        self.data[idx] = data
+        self.keys[idx] = key ^ data
 
 
 # ============================================================================
 # COMPLETE TACTICAL DETECTION
 # ============================================================================
 
+# Squares strictly between two aligned squares (0 when not aligned)
+BB_BETWEEN = [[chess.between(a, b) for b in chess.SQUARES] for a in chess.SQUARES]
+
+
+# Ray directions as (file step, rank step): orthogonal first, then diagonal
+RAY_DIRECTIONS = [(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1)]
+
+
+def _init_rays() -> List[List[Tuple[int, bool, bool]]]:
+    """For each square, the non-empty rays to the board edge as
+    (ray bitboard, nearest square is the lsb, diagonal)."""
+    rays = []
+    for square in chess.SQUARES:
+        square_rays = []
+        for dir_file, dir_rank in RAY_DIRECTIONS:
+            ray = 0
+            file = (square & 7) + dir_file
+            rank = (square >> 3) + dir_rank
+            while 0 <= file < 8 and 0 <= rank < 8:
+                ray |= chess.BB_SQUARES[rank * 8 + file]
+                file += dir_file
+                rank += dir_rank
+            if ray:
+                forward = dir_rank > 0 or (dir_rank == 0 and dir_file > 0)
+                square_rays.append((ray, forward, dir_file != 0 and dir_rank != 0))
+        rays.append(square_rays)
+    return rays
+
+
+BB_RAYS_BEHIND = _init_rays()
+
+
+# Detectors worth running for a move, by the type of the piece on the target
+# square after it (the promoted piece for promotions)
+TACTIC_FORK, TACTIC_PIN, TACTIC_SKEWER, TACTIC_TRAP, TACTIC_DISCOVERED, TACTIC_PROMOTION = 1, 2, 4, 8, 16, 32
+_TACTICS_SLIDER = TACTIC_FORK | TACTIC_PIN | TACTIC_SKEWER | TACTIC_TRAP | TACTIC_DISCOVERED
+TACTICS_BY_PIECE_TYPE = (
+    0,
+    TACTIC_FORK | TACTIC_TRAP | TACTIC_DISCOVERED | TACTIC_PROMOTION,  # pawn
+    TACTIC_FORK | TACTIC_TRAP | TACTIC_DISCOVERED,  # knight
+    _TACTICS_SLIDER,  # bishop
+    _TACTICS_SLIDER,  # rook
+    _TACTICS_SLIDER,  # queen
+    TACTIC_FORK | TACTIC_TRAP | TACTIC_DISCOVERED,  # king
+)
+
+
 class TacticsDetector:
     """Complete tactical detection with all patterns."""
 
-    PIECE_VALUES = {
-        chess.PAWN: 100, chess.KNIGHT: 320, chess.BISHOP: 330,
-        chess.ROOK: 500, chess.QUEEN: 900, chess.KING: 0
-    }
-
     @staticmethod
     def detect_all_tactics(board: chess.Board, move: chess.Move, color: chess.Color) -> List[str]:
-        """Detect all tactical patterns in a move."""
+        """Detect all tactical patterns in a move.
+
+        The trap check pushes the move on the given board and pops it again, so
+        the board must not be used concurrently.
+        """
+        # Enemy pieces worth >= 300 (knights, bishops, rooks, queens)
+        valuable = board.occupied_co[not color] & (board.knights | board.bishops | board.rooks | board.queens)
+
+        heavy = board.occupied_co[not color] & (board.queens | board.rooks)
+
         tactics = []
+        piece_type = move.promotion or board.piece_type_at(move.from_square)
+        checks = TACTICS_BY_PIECE_TYPE[piece_type]
 
         # Fork detection
-        fork = TacticsDetector._detect_fork(board, move, color)
-        if fork:
-            tactics.append(fork)
+        if checks & TACTIC_FORK:
+            fork = TacticsDetector._detect_fork(board, move, color, valuable)
+            if fork:
+                tactics.append(fork)
 
         # Pin detection
-        pin = TacticsDetector._detect_pin(board, move, color)
-        if pin:
-            tactics.append(pin)
+        if checks & TACTIC_PIN:
+            pin = TacticsDetector._detect_pin(board, move, color)
+            if pin:
+                tactics.append(pin)
 
         # Skewer detection
-        skewer = TacticsDetector._detect_skewer(board, move, color)
-        if skewer:
-            tactics.append(skewer)
+        if checks & TACTIC_SKEWER and board.is_capture(move):
+            skewer = TacticsDetector._detect_skewer(board, move, color)
+            if skewer:
+                tactics.append(skewer)
 
         # Trapping detection
-        trap = TacticsDetector._detect_trapping_move(board, move, color)
-        if trap:
-            tactics.append(trap)
+        if checks & TACTIC_TRAP and heavy:
+            # Squares enemy queens and rooks stand on or could go to. Unless it
+            # gives check, a move that neither lands on nor attacks any of them,
+            # directly or by uncovering one of our sliders, cannot trap one.
+            heavy_reach = heavy
+            for square in chess.scan_forward(heavy):
+                heavy_reach |= board.attacks_mask(square)
+            occupied_co, _, _ = TacticsDetector._position_after(board, move)
+            occupied_after = occupied_co[chess.WHITE] | occupied_co[chess.BLACK]
+            reach = (chess.BB_SQUARES[move.to_square] |
+                     TacticsDetector._attacks_from(move.to_square, piece_type, color, occupied_after) |
+                     TacticsDetector._uncovered_attacks(board, move.from_square, color, occupied_after))
+            if reach & heavy_reach or board.gives_check(move):
+                trap = TacticsDetector._detect_trapping_move(board, move, color)
+                if trap:
+                    tactics.append(trap)
 
         # Discovered attack
-        discovered = TacticsDetector._detect_discovered_attack(board, move, color)
-        if discovered:
-            tactics.append(discovered)
+        if checks & TACTIC_DISCOVERED:
+            discovered = TacticsDetector._detect_discovered_attack(board, move, color, valuable)
+            if discovered:
+                tactics.append(discovered)
 
         # Promotion threat
-        if TacticsDetector._is_promotion_threat(board, move, color):
+        if checks & TACTIC_PROMOTION and TacticsDetector._is_promotion_threat(board, move, color):
             tactics.append("Promotion threat")
 
         return tactics
 
     @staticmethod
-    def _detect_fork(board: chess.Board, move: chess.Move, color: chess.Color) -> Optional[str]:
+    def _position_after(board: chess.Board, move: chess.Move) -> Tuple[List[int], int, int]:
+        """Occupancy per color after a move, plus where the moved piece lands and its type.
+
+        Computed from bitboards alone so the detectors never copy or push the board.
+        """
+        us = board.turn
+        from_bb = chess.BB_SQUARES[move.from_square]
+        to_bb = chess.BB_SQUARES[move.to_square]
+        ours = board.occupied_co[us] & ~from_bb
+        theirs = board.occupied_co[not us]
+        piece_type = board.piece_type_at(move.from_square)
+        landing = move.to_square
+
+        if piece_type == chess.KING and board.is_castling(move):
+            rank = move.from_square & 56
+            kingside = (move.to_square & 7) > (move.from_square & 7)
+            if board.rooks & ours & to_bb:
+                rook_from = move.to_square
+            else:
+                rook_from = rank + (7 if kingside else 0)
+            landing = rank + (6 if kingside else 2)
+            rook_to = rank + (5 if kingside else 3)
+            ours = (ours & ~chess.BB_SQUARES[rook_from]) | chess.BB_SQUARES[landing] | chess.BB_SQUARES[rook_to]
+        else:
+            ours |= to_bb
+            theirs &= ~to_bb
+            if board.is_en_passant(move):
+                theirs &= ~chess.BB_SQUARES[move.to_square + (-8 if us == chess.WHITE else 8)]
+
+        occupied_co = [0, 0]
+        occupied_co[us] = ours
+        occupied_co[not us] = theirs
+        return occupied_co, landing, move.promotion or piece_type
+
+    @staticmethod
+    def _attacks_from(square: int, piece_type: int, color: chess.Color, occupied: int) -> int:
+        """Attack bitboard of a piece on a square against a given occupancy."""
+        if piece_type == chess.PAWN:
+            return chess.BB_PAWN_ATTACKS[color][square]
+        if piece_type == chess.KNIGHT:
+            return chess.BB_KNIGHT_ATTACKS[square]
+        if piece_type == chess.KING:
+            return chess.BB_KING_ATTACKS[square]
+        attacks = 0
+        if piece_type == chess.BISHOP or piece_type == chess.QUEEN:
+            attacks = chess.BB_DIAG_ATTACKS[square][chess.BB_DIAG_MASKS[square] & occupied]
+        if piece_type == chess.ROOK or piece_type == chess.QUEEN:
+            attacks |= (chess.BB_RANK_ATTACKS[square][chess.BB_RANK_MASKS[square] & occupied] |
+                        chess.BB_FILE_ATTACKS[square][chess.BB_FILE_MASKS[square] & occupied])
+        return attacks
+
+    @staticmethod
+    def _detect_fork(board: chess.Board, move: chess.Move, color: chess.Color,
+                     valuable: Optional[int] = None) -> Optional[str]:
         """Detect if a move creates a fork."""
-        board_copy = board.copy()
-        board_copy.push(move)
-
-        attacking_square = move.to_square
-        attacked_squares = board_copy.attacks(attacking_square)
-
-        valuable_targets = []
-        for square in attacked_squares:
-            piece = board_copy.piece_at(square)
-            if piece and piece.color != color:
-                value = TacticsDetector.PIECE_VALUES.get(piece.piece_type, 0)
-                if value >= 300:
-                    valuable_targets.append((piece.piece_type, value))
-
-        if len(valuable_targets) >= 2:
-            valuable_targets.sort(key=lambda x: x[1], reverse=True)
-            piece_names = {
-                chess.KNIGHT: "N", chess.BISHOP: "B",
-                chess.ROOK: "R", chess.QUEEN: "Q", chess.KING: "K"
-            }
-            targets_str = ", ".join([piece_names.get(p, "P") for p, _ in valuable_targets[:2]])
+        if valuable is None:
+            valuable = board.occupied_co[not color] & (board.knights | board.bishops | board.rooks | board.queens)
+
+        occupied_co, attacking_square, piece_type = TacticsDetector._position_after(board, move)
+        occupied = occupied_co[chess.WHITE] | occupied_co[chess.BLACK]
+        hit = TacticsDetector._attacks_from(attacking_square, piece_type, board.turn, occupied)
+        hit &= occupied_co[not color] & valuable
+
+        # At least two valuable targets
+        if hit & (hit - 1):
+            valuable_targets = sorted((board.piece_type_at(square) for square in chess.scan_forward(hit)),
+                                      key=PIECE_VALUES_ARR.__getitem__, reverse=True)
+            targets_str = ", ".join([PIECE_LETTERS[p] for p in valuable_targets[:2]])
             return f"Fork ({targets_str})"
 
         return None
@@ -218,165 +646,150 @@ class TacticsDetector:
     @staticmethod
     def _detect_pin(board: chess.Board, move: chess.Move, color: chess.Color) -> Optional[str]:
         """Detect if a move creates a pin."""
-        board_copy = board.copy()
-        board_copy.push(move)
-
-        attacker_square = move.to_square
-        attacker_piece = board_copy.piece_at(attacker_square)
+        occupied_co, attacker_square, piece_type = TacticsDetector._position_after(board, move)
 
-        if not attacker_piece or attacker_piece.piece_type not in [chess.BISHOP, chess.ROOK, chess.QUEEN]:
+        if piece_type not in [chess.BISHOP, chess.ROOK, chess.QUEEN]:
             return None
 
-        opp_king_square = board_copy.king(not color)
+        opp_king_square = board.king(not color)
         if opp_king_square is None:
             return None
 
         # Check if attacker and king are aligned
-        if not (chess.square_file(attacker_square) == chess.square_file(opp_king_square) or
-                chess.square_rank(attacker_square) == chess.square_rank(opp_king_square) or
-                abs(chess.square_file(attacker_square) - chess.square_file(opp_king_square)) ==
-                abs(chess.square_rank(attacker_square) - chess.square_rank(opp_king_square))):
+        if not chess.BB_RAYS[attacker_square][opp_king_square]:
             return None
 
-        # Find squares between attacker and king
-        direction_file = 1 if chess.square_file(opp_king_square) > chess.square_file(attacker_square) else -1 if chess.square_file(opp_king_square) < chess.square_file(attacker_square) else 0
-        direction_rank = 1 if chess.square_rank(opp_king_square) > chess.square_rank(attacker_square) else -1 if chess.square_rank(opp_king_square) < chess.square_rank(attacker_square) else 0
-
-        pinned_pieces = []
-        current_file = chess.square_file(attacker_square) + direction_file
-        current_rank = chess.square_rank(attacker_square) + direction_rank
-
-        while (0 <= current_file < 8 and 0 <= current_rank < 8 and
-               chess.square(current_file, current_rank) != opp_king_square):
-            square = chess.square(current_file, current_rank)
-            piece = board_copy.piece_at(square)
-            if piece:
-                if piece.color != color:
-                    pinned_pieces.append((square, piece.piece_type))
-                else:
-                    break  # Our piece blocks the line
-            current_file += direction_file
-            current_rank += direction_rank
-
-        if len(pinned_pieces) == 1:
-            square, piece_type = pinned_pieces[0]
-            piece_names = {
-                chess.PAWN: "pawn", chess.KNIGHT: "knight",
-                chess.BISHOP: "bishop", chess.ROOK: "rook", chess.QUEEN: "queen"
-            }
-            piece_name = piece_names.get(piece_type, "piece")
-            return f"Pin ({piece_name} to king)"
+        # Exactly one piece, an enemy one, between attacker and king
+        between = BB_BETWEEN[attacker_square][opp_king_square] & (occupied_co[chess.WHITE] | occupied_co[chess.BLACK])
+        if between and not between & (between - 1) and not between & occupied_co[color]:
+            pinned_type = board.piece_type_at(chess.lsb(between))
+            return f"Pin ({PIECE_NAMES[pinned_type]} to king)"
 
         return None
 
     @staticmethod
     def _detect_skewer(board: chess.Board, move: chess.Move, color: chess.Color) -> Optional[str]:
         """Detect if a move creates a skewer (like pin but attacks valuable piece through less valuable one)."""
-        board_copy = board.copy()
-        board_copy.push(move)
-
         # Check if the move is a capture that reveals attack on more valuable piece
         if board.is_capture(move):
             from_square = move.from_square
             to_square = move.to_square
 
-            # Get direction
-            file_diff = chess.square_file(to_square) - chess.square_file(from_square)
-            rank_diff = chess.square_rank(to_square) - chess.square_rank(from_square)
-
-            if file_diff == 0 or rank_diff == 0 or abs(file_diff) == abs(rank_diff):
-                # Continue in same direction
-                direction_file = 0 if file_diff == 0 else (1 if file_diff > 0 else -1)
-                direction_rank = 0 if rank_diff == 0 else (1 if rank_diff > 0 else -1)
-
-                current_file = chess.square_file(to_square) + direction_file
-                current_rank = chess.square_rank(to_square) + direction_rank
-
-                while 0 <= current_file < 8 and 0 <= current_rank < 8:
-                    square = chess.square(current_file, current_rank)
-                    piece = board_copy.piece_at(square)
-                    if piece:
-                        if piece.color != color:
-                            piece_value = TacticsDetector.PIECE_VALUES.get(piece.piece_type, 0)
-                            captured_value = TacticsDetector.PIECE_VALUES.get(
-                                board.piece_at(to_square).piece_type, 0
-                            ) if board.piece_at(to_square) else 0
-                            if piece_value > captured_value:
-                                return "Skewer"
-                        break
-                    current_file += direction_file
-                    current_rank += direction_rank
+            # Continue in same direction, past the target square. Nothing
+            # beyond it changes with the move, so the current board will do.
+            ray = chess.BB_RAYS[from_square][to_square]
+            if ray:
+                if to_square > from_square:
+                    blockers = ray & ~((chess.BB_SQUARES[to_square] << 1) - 1) & board.occupied
+                    square = chess.lsb(blockers) if blockers else None
+                else:
+                    blockers = ray & (chess.BB_SQUARES[to_square] - 1) & board.occupied
+                    square = chess.msb(blockers) if blockers else None
+
+                if square is not None and not board.occupied_co[color] & chess.BB_SQUARES[square]:
+                    piece_value = PIECE_VALUES_ARR[board.piece_type_at(square)]
+                    captured_value = PIECE_VALUES_ARR[board.piece_type_at(to_square) or 0]
+                    if piece_value > captured_value:
+                        return "Skewer"
 
         return None
 
     @staticmethod
     def _detect_trapping_move(board: chess.Board, move: chess.Move, color: chess.Color) -> Optional[str]:
-        """Detect if a move traps an opponent piece."""
-        board_copy = board.copy()
-        board_copy.push(move)
-
-        # Check all opponent pieces
-        for square in chess.SQUARES:
-            piece = board_copy.piece_at(square)
-            if piece and piece.color != color and piece.piece_type in [chess.QUEEN, chess.ROOK]:
+        """Detect if a move traps an opponent piece.
+
+        The move is pushed on the given board and popped again before returning,
+        so the board must not be used concurrently.
+        """
+        board.push(move)
+        try:
+            # Check opponent queens and rooks only
+            opp = not color
+            opp_occupied = board.occupied_co[opp]
+            occupied = board.occupied
+            queens = board.queens
+            heavy = opp_occupied & (queens | board.rooks)
+            # Only the side to move has legal moves; evasions need the full legality test
+            to_move = board.turn == opp
+            in_check = to_move and board.is_check()
+            for square in chess.scan_forward(heavy):
+                square_bb = chess.BB_SQUARES[square]
+
+                # Slider moves are pseudo-legal by construction; a pinned piece
+                # may only move along the pin
+                targets = 0
+                if to_move:
+                    targets = board.attacks_mask(square) & ~opp_occupied & board.pin_mask(opp, square)
+
                 # Check if piece has safe squares
                 safe_squares = 0
-                for target_square in chess.SQUARES:
-                    try:
-                        test_move = chess.Move(square, target_square)
-                        if test_move in board_copy.legal_moves:
-                            # Check if moving would leave piece hanging
-                            temp_board = board_copy.copy()
-                            temp_board.push(test_move)
-                            attackers = temp_board.attackers(color, target_square)
-                            defenders = temp_board.attackers(not color, target_square)
-                            if len(attackers) == 0 or len(defenders) >= len(attackers):
-                                safe_squares += 1
-                    except:
+                for target_square in chess.scan_forward(targets):
+                    if in_check and not board.is_legal(chess.Move(square, target_square)):
                         continue
 
+                    # Check if moving would leave piece hanging
+                    target_bb = chess.BB_SQUARES[target_square]
+                    occupied_after = (occupied & ~square_bb) | target_bb
+                    attackers = _popcount(board.attackers_mask(color, target_square, occupied_after))
+                    defenders = _popcount(board.attackers_mask(opp, target_square, occupied_after) & ~square_bb)
+                    if attackers == 0 or defenders >= attackers:
+                        safe_squares += 1
+                        break
+
                 if safe_squares == 0:
-                    piece_names = {chess.ROOK: "rook", chess.QUEEN: "queen"}
-                    return f"Traps {piece_names[piece.piece_type]}"
+                    return f"Traps {PIECE_NAMES[chess.QUEEN if queens & square_bb else chess.ROOK]}"
 
-        return None
+            return None
+        finally:
+            board.pop()
 
     @staticmethod
-    def _detect_discovered_attack(board: chess.Board, move: chess.Move, color: chess.Color) -> Optional[str]:
+    def _detect_discovered_attack(board: chess.Board, move: chess.Move, color: chess.Color,
+                                  valuable: Optional[int] = None) -> Optional[str]:
         """Detect if a move creates a discovered attack."""
-        from_square = move.from_square
+        if valuable is None:
+            valuable = board.occupied_co[not color] & (board.knights | board.bishops | board.rooks | board.queens)
 
-        # Check pieces that might be behind the moving piece
-        for direction in [(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1)]:
-            file = chess.square_file(from_square) - direction[0]
-            rank = chess.square_rank(from_square) - direction[1]
-
-            while 0 <= file < 8 and 0 <= rank < 8:
-                square = chess.square(file, rank)
-                piece = board.piece_at(square)
-                if piece and piece.color == color and piece.piece_type in [chess.BISHOP, chess.ROOK, chess.QUEEN]:
-                    # This piece might now have an open line
-                    # Check if it attacks something valuable
-                    attacks = board.attacks(square)
-                    for target in attacks:
-                        target_piece = board.piece_at(target)
-                        if (target_piece and target_piece.color != color and
-                            TacticsDetector.PIECE_VALUES.get(target_piece.piece_type, 0) >= 300):
-                            return "Discovered attack"
-                    break
-                elif piece:
-                    break  # Blocked by other piece
-                file -= direction[0]
-                rank -= direction[1]
+        occupied_co, _, _ = TacticsDetector._position_after(board, move)
+        occupied_after = occupied_co[chess.WHITE] | occupied_co[chess.BLACK]
+        uncovered = TacticsDetector._uncovered_attacks(board, move.from_square, color, occupied_after)
+        if uncovered & occupied_co[not color] & valuable:
+            return "Discovered attack"
 
         return None
 
+    @staticmethod
+    def _uncovered_attacks(board: chess.Board, from_square: int, color: chess.Color, occupied_after: int) -> int:
+        """Squares our sliders behind from_square newly attack once it is vacated,
+        not counting squares they already attacked."""
+        occupied = board.occupied
+        ours = board.occupied_co[color]
+        diagonal_sliders = ours & (board.bishops | board.queens)
+        orthogonal_sliders = ours & (board.rooks | board.queens)
+        uncovered = 0
+
+        # Check pieces that might be behind the moving piece, and that slide
+        # along that line
+        for ray, forward, diagonal in BB_RAYS_BEHIND[from_square]:
+            blockers = ray & occupied
+            if not blockers:
+                continue
+            square = chess.lsb(blockers) if forward else chess.msb(blockers)
+            if not (diagonal_sliders if diagonal else orthogonal_sliders) & chess.BB_SQUARES[square]:
+                continue
+
+            piece_type = board.piece_type_at(square)
+            attacks = TacticsDetector._attacks_from(square, piece_type, color, occupied_after)
+            uncovered |= attacks & ~TacticsDetector._attacks_from(square, piece_type, color, occupied)
+
+        return uncovered
+
     @staticmethod
     def _is_promotion_threat(board: chess.Board, move: chess.Move, color: chess.Color) -> bool:
         """Check if a move creates a pawn promotion threat."""
         piece = board.piece_at(move.from_square)
         if piece and piece.piece_type == chess.PAWN and piece.color == color:
-            rank = chess.square_rank(move.to_square)
+            rank = move.to_square >> 3
             if (color == chess.WHITE and rank == 6) or (color == chess.BLACK and rank == 1):
                 return True
         return False
@@ -386,6 +799,70 @@ class TacticsDetector:
 # PERFECT CHESS ENGINE
 # ============================================================================
 
+# Files either side of each file
+BB_ADJACENT_FILES = [(chess.BB_FILES[file - 1] if file > 0 else 0) | (chess.BB_FILES[file + 1] if file < 7 else 0)
+                     for file in range(8)]
+
+
+def _init_passed_masks() -> List[List[int]]:
+    """Squares on the pawn's file and the adjacent files ahead of it, per color.
+
+    A pawn is passed when no enemy pawn stands on its mask.
+    """
+    masks = [[0] * 64, [0] * 64]
+    for sq in chess.SQUARES:
+        file = sq & 7
+        rank = sq >> 3
+        files = chess.BB_FILES[file]
+        if file > 0:
+            files |= chess.BB_FILES[file - 1]
+        if file < 7:
+            files |= chess.BB_FILES[file + 1]
+        # Ranks strictly above (white) or below (black) the pawn
+        masks[chess.WHITE][sq] = files & ~((1 << ((rank + 1) * 8)) - 1)
+        masks[chess.BLACK][sq] = files & ((1 << (rank * 8)) - 1)
+    return masks
+
+
+BB_PASSED_MASKS = _init_passed_masks()
+
+
+def _init_shield_masks() -> List[List[int]]:
+    """Pawn shield squares per color and king square: the king's file and the
+    adjacent files, one and two ranks in front of the king."""
+    masks = [[0] * 64, [0] * 64]
+    for sq in chess.SQUARES:
+        file = sq & 7
+        rank = sq >> 3
+        for shield_file in (file - 1, file, file + 1):
+            if not 0 <= shield_file < 8:
+                continue
+            for rank_offset in (1, 2):
+                if rank + rank_offset < 8:
+                    masks[chess.WHITE][sq] |= chess.BB_SQUARES[(rank + rank_offset) * 8 + shield_file]
+                if rank - rank_offset >= 0:
+                    masks[chess.BLACK][sq] |= chess.BB_SQUARES[(rank - rank_offset) * 8 + shield_file]
+    return masks
+
+
+BB_SHIELD_MASKS = _init_shield_masks()
+
+
+def _init_pst(pst: Dict[int, List[int]], piece_values: Dict[int, int]) -> Tuple[List[List[int]], List[List[int]]]:
+    """Material plus piece-square value per color, indexed as [piece_type][square].
+
+    Black's table is mirrored so both colors index by their actual square.
+    """
+    white = [[0] * 64]
+    black = [[0] * 64]
+    for piece_type in chess.PIECE_TYPES:
+        value = piece_values[piece_type]
+        table = pst[piece_type]
+        white.append([value + table[sq] for sq in chess.SQUARES])
+        black.append([value + table[chess.square_mirror(sq)] for sq in chess.SQUARES])
+    return white, black
+
+
 class PerfectChessEngine:
     """Complete chess engine with all features."""
 
@@ -458,19 +935,26 @@ class PerfectChessEngine:
         ]
     }
 
+    PST_WHITE, PST_BLACK = _init_pst(PST, PIECE_VALUES)
+
+    # Move ordering bonus for the target square: (7 - Manhattan distance to the center) * 10
+    CENTER_BONUS = tuple(int(7 - (abs(3.5 - (sq & 7)) + abs(3.5 - (sq >> 3)))) * 10 for sq in chess.SQUARES)
+
     MATE_SCORE = 100000
     MAX_PLY = 128
 
-    def __init__(self, num_workers: int = None):
-        self.board = chess.Board()
+    def __init__(self, num_workers: int = None, tt: Optional[TranspositionTable] = None):
+        self.board = ZobristBoard()
         self.play_as_white = True
         self.nodes = 0
-        self.tt = TranspositionTable()
+        self.tt = tt if tt is not None else TranspositionTable()
         self.killer_moves = [[None, None] for _ in range(self.MAX_PLY)]
-        self.history_table = [[[0 for _ in range(64)] for _ in range(64)] for _ in range(2)]
+        # History scores, flat and indexed by color * 4096 + from * 64 + to
+        self.history_table = [0] * 8192
         self.search_start_time = 0
         self.time_limit = 30
         self.num_workers = num_workers if num_workers else max(1, cpu_count() - 1)
+        self.verbose = True
 
         self.tt_hits = 0
         self.killer_hits = 0
@@ -489,47 +973,41 @@ class PerfectChessEngine:
 
         score = 0
 
-        # Material + PST
-        for piece_type in [chess.PAWN, chess.KNIGHT, chess.BISHOP, chess.ROOK, chess.QUEEN, chess.KING]:
-            for color in [chess.WHITE, chess.BLACK]:
-                pieces = board.pieces(piece_type, color)
-                value = self.PIECE_VALUES[piece_type]
-
-                for sq in pieces:
-                    if color == chess.WHITE:
-                        score += value
-                        if piece_type in self.PST:
-                            score += self.PST[piece_type][sq]
-                    else:
-                        score -= value
-                        if piece_type in self.PST:
-                            score -= self.PST[piece_type][chess.square_mirror(sq)]
-
-        # FIXED: Mobility calculation (using null move properly)
-        our_moves = len(list(board.legal_moves))
-        
-        # Count opponent moves by making null move
-        board_copy = board.copy()
-        try:
-            board_copy.push(chess.Move.null())
-            opp_moves = len(list(board_copy.legal_moves))
-        except:
-            # Null move illegal (in check or other rare cases)
-            opp_moves = our_moves
-        
-        mobility = (our_moves - opp_moves) * 5  # Reduced from 10 to 5
-        score += mobility if board.turn == chess.WHITE else -mobility
+        # Pawns and king squares indexed by color, shared by the pawn and
+        # king evaluations below
+        white = board.occupied_co[chess.WHITE]
+        black = board.occupied_co[chess.BLACK]
+        pawns = [board.pawns & black, board.pawns & white]
+        kings = [board.king(chess.BLACK), board.king(chess.WHITE)]
+
+        # Material + PST, walked straight off the bitboards
+        for piece_type in chess.PIECE_TYPES:
+            table = self.PST_WHITE[piece_type]
+            pieces = board.pieces_mask(piece_type, chess.WHITE)
+            while pieces:
+                score += table[(pieces & -pieces).bit_length() - 1]
+                pieces &= pieces - 1
+
+            table = self.PST_BLACK[piece_type]
+            pieces = board.pieces_mask(piece_type, chess.BLACK)
+            while pieces:
+                score -= table[(pieces & -pieces).bit_length() - 1]
+                pieces &= pieces - 1
+
+        # Mobility from piece attack masks, no move generation
+        mobility = (self._mobility(board, chess.WHITE) - self._mobility(board, chess.BLACK)) * 5
+        score += mobility
 
         # NEW: Passed pawn evaluation (CRITICAL for pawn endgames!)
-        passed_pawn_score = self.evaluate_passed_pawns(board)
+        passed_pawn_score = self.evaluate_passed_pawns(board, pawns, kings)
         score += passed_pawn_score
 
         # Pawn structure
-        pawn_structure = self.evaluate_pawn_structure(board)
+        pawn_structure = self.evaluate_pawn_structure(board, pawns)
         score += pawn_structure
 
         # King safety
-        king_safety = self.evaluate_king_safety(board)
+        king_safety = self.evaluate_king_safety(board, pawns, kings)
         score += king_safety
 
         # Convert to side-to-move perspective
@@ -538,200 +1016,110 @@ class PerfectChessEngine:
 
         return score
 
-    def evaluate_passed_pawns(self, board: chess.Board) -> int:
+    def _pawn_bitboards(self, board: chess.Board) -> List[int]:
+        """Pawn bitboards indexed by color."""
+        return [board.pieces_mask(chess.PAWN, chess.BLACK), board.pieces_mask(chess.PAWN, chess.WHITE)]
+
+    def _mobility(self, board: chess.Board, color: chess.Color) -> int:
+        """Pseudo-legal knight, bishop, rook and queen moves of one side."""
+        ours = board.occupied_co[color]
+        count = 0
+        for sq in chess.scan_forward(ours & (board.knights | board.bishops | board.rooks | board.queens)):
+            count += _popcount(board.attacks_mask(sq) & ~ours)
+        return count
+
+    def evaluate_passed_pawns(self, board: chess.Board, pawns: Optional[List[int]] = None,
+                              kings: Optional[List[Optional[int]]] = None) -> int:
         """
         Evaluate passed pawns with the Square Rule for unstoppable pawns.
         This is CRITICAL for finding queen trades that create passed pawns!
         """
+        if pawns is None:
+            pawns = self._pawn_bitboards(board)
+        if kings is None:
+            kings = [board.king(chess.BLACK), board.king(chess.WHITE)]
         score = 0
-        
+        occupied = board.occupied
+        turn = board.turn
+
         for color in [chess.WHITE, chess.BLACK]:
-            pawns = list(board.pieces(chess.PAWN, color))
-            
-            for pawn_square in pawns:
-                file = chess.square_file(pawn_square)
-                rank = chess.square_rank(pawn_square)
-                
+            passed_masks = BB_PASSED_MASKS[color]
+            enemy_pawns = pawns[not color]
+            our_king = kings[color]
+            enemy_king = kings[not color]
+            # The enemy king gets one extra tempo when it moves first (Square Rule)
+            king_tempo = 0 if turn == color else 1
+
+            for pawn_square in chess.scan_forward(pawns[color]):
                 # Check if this pawn is passed (no enemy pawns blocking it)
-                is_passed = self._is_passed_pawn(board, pawn_square, color)
-                
-                if is_passed:
-                    # Base passed pawn bonus
-                    pawn_bonus = 50
-                    
-                    # Advancement bonus (more advanced = more dangerous)
-                    if color == chess.WHITE:
-                        advancement = rank  # 0-7
-                    else:
-                        advancement = 7 - rank  # 7-0
-                    
-                    # Exponential growth: 7th rank pawn is VERY dangerous
-                    advancement_bonus = advancement * advancement * 5  # 0, 5, 20, 45, 80, 125, 180, 245
-                    pawn_bonus += advancement_bonus
-                    
-                    # Check if pawn is unstoppable (Square Rule)
-                    if self._is_unstoppable_pawn(board, pawn_square, color):
-                        pawn_bonus += 400  # Almost a piece! Will promote to queen
-                    
-                    # Check if pawn is supported by our king
-                    elif self._is_pawn_supported_by_king(board, pawn_square, color):
-                        pawn_bonus += 50  # King helps push pawn
-                    
-                    # Check if blocked by enemy piece
-                    if self._is_pawn_blocked(board, pawn_square, color):
-                        pawn_bonus //= 2  # Half value if can't advance
-                    
-                    # Add to score (positive for white, negative for black)
-                    if color == chess.WHITE:
-                        score += pawn_bonus
-                    else:
-                        score -= pawn_bonus
-        
-        return score
-    
-    def _is_passed_pawn(self, board: chess.Board, pawn_square: int, color: chess.Color) -> bool:
-        """Check if pawn is passed (no enemy pawns blocking it)."""
-        file = chess.square_file(pawn_square)
-        rank = chess.square_rank(pawn_square)
-        
-        # Check the three files (left, center, right)
-        for check_file in [file - 1, file, file + 1]:
-            if check_file < 0 or check_file > 7:
-                continue
-            
-            # Check all ranks ahead of this pawn
-            if color == chess.WHITE:
-                ranks_to_check = range(rank + 1, 8)
-            else:
-                ranks_to_check = range(0, rank)
-            
-            for check_rank in ranks_to_check:
-                square = chess.square(check_file, check_rank)
-                piece = board.piece_at(square)
-                
-                # If there's an enemy pawn ahead, not passed
-                if piece and piece.piece_type == chess.PAWN and piece.color != color:
-                    return False
-        
-        return True
-    
-    def _is_unstoppable_pawn(self, board: chess.Board, pawn_square: int, color: chess.Color) -> bool:
-        """
-        Use the Square Rule to check if pawn is unstoppable.
-        The Square Rule: Draw a square from the pawn to its promotion square.
-        If the enemy king is outside this square (and it's our turn), pawn is unstoppable.
-        """
-        file = chess.square_file(pawn_square)
-        rank = chess.square_rank(pawn_square)
-        
-        # Find promotion square
-        if color == chess.WHITE:
-            promotion_square = chess.square(file, 7)
-            moves_to_promote = 7 - rank
-        else:
-            promotion_square = chess.square(file, 0)
-            moves_to_promote = rank
-        
-        # Adjust for pawn's first move (can move 2 squares)
-        if color == chess.WHITE and rank == 1:
-            moves_to_promote -= 1
-        elif color == chess.BLACK and rank == 6:
-            moves_to_promote -= 1
-        
-        # Get enemy king position
-        enemy_king_square = board.king(not color)
-        if enemy_king_square is None:
-            return False
-        
-        # Calculate enemy king distance to promotion square (Chebyshev distance)
-        enemy_king_file = chess.square_file(enemy_king_square)
-        enemy_king_rank = chess.square_rank(enemy_king_square)
-        promo_file = chess.square_file(promotion_square)
-        promo_rank = chess.square_rank(promotion_square)
-        
-        king_distance = max(abs(enemy_king_file - promo_file), abs(enemy_king_rank - promo_rank))
-        
-        # Square Rule: If king distance > pawn distance (considering who moves next)
-        # If it's our turn, pawn gets head start
-        if board.turn == color:
-            # Our turn: pawn moves first
-            if king_distance > moves_to_promote:
-                return True
-        else:
-            # Opponent's turn: king moves first
-            if king_distance > moves_to_promote + 1:
-                return True
-        
-        return False
-    
-    def _is_pawn_supported_by_king(self, board: chess.Board, pawn_square: int, color: chess.Color) -> bool:
-        """Check if our king is close enough to support the pawn."""
-        our_king_square = board.king(color)
-        if our_king_square is None:
-            return False
-        
-        # Calculate king distance to pawn (Chebyshev)
-        king_file = chess.square_file(our_king_square)
-        king_rank = chess.square_rank(our_king_square)
-        pawn_file = chess.square_file(pawn_square)
-        pawn_rank = chess.square_rank(pawn_square)
-        
-        distance = max(abs(king_file - pawn_file), abs(king_rank - pawn_rank))
-        
-        # King is supporting if within 2 squares
-        return distance <= 2
-    
-    def _is_pawn_blocked(self, board: chess.Board, pawn_square: int, color: chess.Color) -> bool:
-        """Check if pawn is blocked by any piece."""
-        file = chess.square_file(pawn_square)
-        rank = chess.square_rank(pawn_square)
-        
-        # Check square directly ahead
-        if color == chess.WHITE:
-            ahead_square = chess.square(file, rank + 1) if rank < 7 else None
-        else:
-            ahead_square = chess.square(file, rank - 1) if rank > 0 else None
-        
-        if ahead_square is None:
-            return False
-        
-        piece = board.piece_at(ahead_square)
-        return piece is not None
+                if passed_masks[pawn_square] & enemy_pawns:
+                    continue
+
+                rank = pawn_square >> 3
+                file = pawn_square & 7
+
+                # Advancement (more advanced = more dangerous) and squares left
+                # to the promotion square, a double step counting as one
+                if color == chess.WHITE:
+                    advancement = rank
+                    moves_to_promote = 7 - rank - (rank == 1)
+                    promotion_square = 56 + file
+                    ahead_square = pawn_square + 8
+                else:
+                    advancement = 7 - rank
+                    moves_to_promote = rank - (rank == 6)
+                    promotion_square = file
+                    ahead_square = pawn_square - 8
+
+                # Base passed pawn bonus plus exponential growth: 7th rank
+                # pawn is VERY dangerous (0, 5, 20, 45, 80, 125, 180, 245)
+                pawn_bonus = 50 + advancement * advancement * 5
+
+                # Unstoppable pawn (Square Rule): will promote to queen
+                if (enemy_king is not None and
+                        chess.square_distance(enemy_king, promotion_square) > moves_to_promote + king_tempo):
+                    pawn_bonus += 400
+
+                # Our king within 2 squares helps push the pawn
+                elif our_king is not None and chess.square_distance(our_king, pawn_square) <= 2:
+                    pawn_bonus += 50
+
+                # Half value if can't advance
+                if 0 <= ahead_square < 64 and occupied & chess.BB_SQUARES[ahead_square]:
+                    pawn_bonus //= 2
+
+                # Add to score (positive for white, negative for black)
+                if color == chess.WHITE:
+                    score += pawn_bonus
+                else:
+                    score -= pawn_bonus
 
+        return score
 
-    def evaluate_pawn_structure(self, board: chess.Board) -> int:
+    def evaluate_pawn_structure(self, board: chess.Board, pawns: Optional[List[int]] = None) -> int:
         """Evaluate pawn structure."""
+        if pawns is None:
+            pawns = self._pawn_bitboards(board)
         score = 0
         
         for color in [chess.WHITE, chess.BLACK]:
-            pawns = list(board.pieces(chess.PAWN, color))
-            files = [chess.square_file(p) for p in pawns]
-            
-            # Doubled pawns penalty
-            file_counts = {}
-            for f in files:
-                file_counts[f] = file_counts.get(f, 0) + 1
+            own_pawns = pawns[color]
             
             doubled_penalty = 0
-            for count in file_counts.values():
-                if count > 1:
-                    doubled_penalty += (count - 1) * 20
-            
-            # Isolated pawns penalty
             isolated_penalty = 0
-            for pawn in pawns:
-                file = chess.square_file(pawn)
-                has_friend = False
-                for adj_file in [file - 1, file + 1]:
-                    if 0 <= adj_file < 8:
-                        for other in pawns:
-                            if chess.square_file(other) == adj_file:
-                                has_friend = True
-                                break
-                    if has_friend:
-                        break
-                if not has_friend:
-                    isolated_penalty += 15
+            for file in range(8):
+                on_file = own_pawns & chess.BB_FILES[file]
+                if not on_file:
+                    continue
+                count = _popcount(on_file)
+
+                # Doubled pawns penalty
+                doubled_penalty += (count - 1) * 20
+
+                # Isolated pawns penalty, for every pawn on a file with no
+                # friendly pawns either side
+                if not own_pawns & BB_ADJACENT_FILES[file]:
+                    isolated_penalty += count * 15
             
             if color == chess.WHITE:
                 score -= doubled_penalty + isolated_penalty
@@ -740,38 +1128,23 @@ class PerfectChessEngine:
         
         return score
 
-    def evaluate_king_safety(self, board: chess.Board) -> int:
+    def evaluate_king_safety(self, board: chess.Board, pawns: Optional[List[int]] = None,
+                             kings: Optional[List[Optional[int]]] = None) -> int:
         """Evaluate king safety based on pawn shield."""
+        if pawns is None:
+            pawns = self._pawn_bitboards(board)
+        if kings is None:
+            kings = [board.king(chess.BLACK), board.king(chess.WHITE)]
         score = 0
         
         for color in [chess.WHITE, chess.BLACK]:
-            king_sq = board.king(color)
+            king_sq = kings[color]
             if king_sq is None:
                 continue
             
-            king_file = chess.square_file(king_sq)
-            king_rank = chess.square_rank(king_sq)
-            
-            pawn_shield = 0
-            for file_offset in [-1, 0, 1]:
-                file = king_file + file_offset
-                if 0 <= file < 8:
-                    if color == chess.WHITE:
-                        # FIXED: Check ranks ABOVE white king (higher ranks)
-                        for rank_offset in [1, 2]:
-                            rank = king_rank + rank_offset  # UP for white
-                            if 0 <= rank < 8:
-                                sq = chess.square(file, rank)
-                                if board.piece_at(sq) == chess.Piece(chess.PAWN, color):
-                                    pawn_shield += 15
-                    else:
-                        # Black king: check ranks below (lower ranks)
-                        for rank_offset in [1, 2]:
-                            rank = king_rank - rank_offset  # DOWN for black
-                            if 0 <= rank < 8:
-                                sq = chess.square(file, rank)
-                                if board.piece_at(sq) == chess.Piece(chess.PAWN, color):
-                                    pawn_shield += 15
+            # Own pawns on the shield squares in front of the king
+            shield = BB_SHIELD_MASKS[color][king_sq] & pawns[color]
+            pawn_shield = _popcount(shield) * 15
             
             if color == chess.WHITE:
                 score += pawn_shield
@@ -780,23 +1153,6 @@ class PerfectChessEngine:
         
         return score
 
-    def get_capture_value(self, board: chess.Board, move: chess.Move) -> Tuple[int, int]:
-        """Get victim and attacker values."""
-        if board.is_en_passant(move):
-            return self.PIECE_VALUES[chess.PAWN], self.PIECE_VALUES[chess.PAWN]
-        
-        victim_piece = board.piece_at(move.to_square)
-        victim_value = self.PIECE_VALUES.get(victim_piece.piece_type, 0) if victim_piece else 0
-        
-        attacker_piece = board.piece_at(move.from_square)
-        attacker_value = self.PIECE_VALUES.get(attacker_piece.piece_type, 0) if attacker_piece else 0
-        
-        return victim_value, attacker_value
-
-    def mvv_lva_score(self, victim_value: int, attacker_value: int) -> int:
-        """MVV-LVA: victim * 10 - attacker."""
-        return victim_value * 10 - attacker_value
-
     def quiescence(self, board: chess.Board, alpha: int, beta: int, ply: int = 0) -> int:
         """Quiescence search with proper bounds."""
         self.nodes += 1
@@ -812,32 +1168,42 @@ class PerfectChessEngine:
             return alpha
 
         # Generate tactical moves
+        turn = board.turn
+        them = board.occupied_co[not turn]
+        ep_square = board.ep_square
+        check_squares = self._check_squares(board, not turn)
         tactical_moves = []
+        priorities = {}
         for move in board.legal_moves:
             priority = 0
-
-            if board.is_capture(move):
-                victim_val, attacker_val = self.get_capture_value(board, move)
-                priority = 10000 + self.mvv_lva_score(victim_val, attacker_val)
-                if board.gives_check(move):
+            to_square = move.to_square
+            to_bb = chess.BB_SQUARES[to_square]
+            piece_type = board.piece_type_at(move.from_square)
+            checks = self._slider_check_squares(board, not turn, check_squares, move.from_square, piece_type)
+
+            if to_bb & them or (to_square == ep_square and board.is_en_passant(move)):
+                # An empty target square means en passant, capturing a pawn
+                victim = board.piece_type_at(to_square) or chess.PAWN
+                priority = 10000 + MVV_LVA[(victim << 3) | piece_type]
+                if to_bb & checks:
                     priority += 1000
             elif move.promotion:
                 priority = 15000 + move.promotion * 100
-            elif board.gives_check(move):
+            elif to_bb & checks:
                 priority = 8000
             # Pawn push to 7th rank
-            elif (board.piece_at(move.from_square) and 
-                  board.piece_at(move.from_square).piece_type == chess.PAWN):
-                rank = chess.square_rank(move.to_square)
-                if (board.turn == chess.WHITE and rank == 6) or (board.turn == chess.BLACK and rank == 1):
+            elif piece_type == chess.PAWN:
+                rank = to_square >> 3
+                if (turn == chess.WHITE and rank == 6) or (turn == chess.BLACK and rank == 1):
                     priority = 7000
 
             if priority > 0:
-                tactical_moves.append((move, priority))
+                tactical_moves.append(move)
+                priorities[move] = priority
 
-        tactical_moves.sort(key=lambda x: x[1], reverse=True)
+        tactical_moves.sort(key=priorities.__getitem__, reverse=True)
 
-        for move, _ in tactical_moves:
+        for move in tactical_moves:
             board.push(move)
             score = -self.quiescence(board, -beta, -alpha, ply + 1)
             board.pop()
@@ -849,6 +1215,35 @@ class PerfectChessEngine:
 
         return alpha
 
+    def _check_squares(self, board: chess.Board, color: chess.Color, occupied: Optional[int] = None) -> List[int]:
+        """Squares, per attacking piece type, from which a piece would give
+        direct check to the king of the given color (discovered checks are
+        not included).
+
+        Slider rays stop at the first piece, so a bishop, rook or queen that is
+        that piece and retreats along the same line is missed; callers redo the
+        lookup with occupied excluding its square (see _slider_check_squares).
+        """
+        king_sq = board.king(color)
+        if king_sq is None:
+            return [0] * 7
+        if occupied is None:
+            occupied = board.occupied
+        diagonal = chess.BB_DIAG_ATTACKS[king_sq][chess.BB_DIAG_MASKS[king_sq] & occupied]
+        orthogonal = (chess.BB_RANK_ATTACKS[king_sq][chess.BB_RANK_MASKS[king_sq] & occupied] |
+                      chess.BB_FILE_ATTACKS[king_sq][chess.BB_FILE_MASKS[king_sq] & occupied])
+        return [0, chess.BB_PAWN_ATTACKS[color][king_sq], chess.BB_KNIGHT_ATTACKS[king_sq],
+                diagonal, orthogonal, diagonal | orthogonal, 0]
+
+    def _slider_check_squares(self, board: chess.Board, color: chess.Color, check_squares: List[int],
+                              from_square: int, piece_type: int) -> int:
+        """Direct check squares for a piece of piece_type leaving from_square,
+        including squares beyond it when it stands on the king's line."""
+        from_bb = chess.BB_SQUARES[from_square]
+        if piece_type in (chess.BISHOP, chess.ROOK, chess.QUEEN) and from_bb & check_squares[chess.QUEEN]:
+            return self._check_squares(board, color, board.occupied & ~from_bb)[piece_type]
+        return check_squares[piece_type]
+
     def negamax(self, board: chess.Board, depth: int, alpha: int, beta: int,
                 ply: int = 0, can_null: bool = True) -> Tuple[int, List[chess.Move]]:
         """Negamax with all fixes applied."""
@@ -859,34 +1254,35 @@ class PerfectChessEngine:
             return 0, []
 
         # TT probe
-        tt_hit, tt_score, tt_move, tt_pv = self.tt.probe(board, depth, alpha, beta)
+        tt_key, tt_hit, tt_score, tt_move = self.tt.probe(board, depth, alpha, beta)
         if tt_hit:
             self.tt_hits += 1
-            return tt_score, tt_pv
+            return tt_score, [tt_move] if tt_move else []
 
-        # Game end checks
-        if board.is_checkmate():
-            return -self.MATE_SCORE + ply, []
-        if board.is_stalemate() or board.is_insufficient_material():
+        # Game end checks: checkmate or stalemate, from one legal move probe
+        in_check = board.is_check()
+        if not any(board.generate_legal_moves()):
+            return (-self.MATE_SCORE + ply if in_check else 0), []
+        if board.is_insufficient_material():
             return 0, []
-        if board.can_claim_draw():
+        if board.halfmove_clock >= 100 or board.is_repetition(2):
             return 0, []
 
         if depth <= 0:
             return self.quiescence(board, alpha, beta, ply), []
 
         # Null move pruning
-        if (can_null and depth >= 3 and not board.is_check() and
+        if (can_null and depth >= 3 and not in_check and
             abs(beta) < self.MATE_SCORE - 1000 and self.has_major_pieces(board)):
 
-            board.push(chess.Move.null())
+            board.push(NULL_MOVE)
             null_score, _ = self.negamax(board, depth - 3, -beta, -beta + 1, ply + 1, False)
             null_score = -null_score
             board.pop()
 
             if null_score >= beta:
                 self.null_move_prunes += 1
-                self.tt.store(board, depth, beta, TTFlag.LOWER, None, [])
+                self.tt.store(tt_key, depth, beta, TT_LOWER, None)
                 return beta, []
 
         # Move ordering
@@ -900,10 +1296,22 @@ class PerfectChessEngine:
         best_pv = []
         original_alpha = alpha
 
-        for move in moves:
+        for move_index, move in enumerate(moves):
+            # Late move reductions: late quiet moves get a reduced null-window
+            # search first and are re-searched at full depth only if they beat alpha
+            reduce = (move_index >= 4 and depth >= 3 and not in_check and
+                      not move.promotion and not board.is_capture(move))
+
             board.push(move)
-            score, sub_pv = self.negamax(board, depth - 1, -beta, -alpha, ply + 1, True)
-            score = -score
+            if reduce and not board.is_check():
+                score, sub_pv = self.negamax(board, depth - 2, -alpha - 1, -alpha, ply + 1, True)
+                score = -score
+                if score > alpha:
+                    score, sub_pv = self.negamax(board, depth - 1, -beta, -alpha, ply + 1, True)
+                    score = -score
+            else:
+                score, sub_pv = self.negamax(board, depth - 1, -beta, -alpha, ply + 1, True)
+                score = -score
             board.pop()
 
             if score > alpha:
@@ -921,10 +1329,10 @@ class PerfectChessEngine:
                         self.killer_hits += 1
 
                 # History heuristic
-                color_idx = 0 if board.turn == chess.WHITE else 1
-                self.history_table[color_idx][move.from_square][move.to_square] += depth * depth
+                color_base = 0 if board.turn == chess.WHITE else 4096
+                self.history_table[color_base | (move.from_square << 6) | move.to_square] += depth * depth
 
-                self.tt.store(board, depth, beta, TTFlag.LOWER, move, best_pv)
+                self.tt.store(tt_key, depth, beta, TT_LOWER, move)
                 return beta, best_pv
 
             if score > best_score:
@@ -932,20 +1340,27 @@ class PerfectChessEngine:
 
         # Determine flag
         if alpha <= original_alpha:
-            flag = TTFlag.UPPER
+            flag = TT_UPPER
         elif alpha >= beta:
-            flag = TTFlag.LOWER
+            flag = TT_LOWER
         else:
-            flag = TTFlag.EXACT
+            flag = TT_EXACT
 
-        self.tt.store(board, depth, alpha, flag, best_move, best_pv)
+        self.tt.store(tt_key, depth, alpha, flag, best_move)
         return alpha, best_pv
 
     def order_moves(self, board: chess.Board, ply: int, tt_move: Optional[chess.Move]) -> List[chess.Move]:
         """Move ordering with center control bonus."""
         moves = list(board.legal_moves)
-        scored_moves = []
-        color_idx = 0 if board.turn == chess.WHITE else 1
+        scores = {}
+        history = self.history_table
+        color_base = 0 if board.turn == chess.WHITE else 4096
+        killers = self.killer_moves[ply] if ply < self.MAX_PLY else [None, None]
+        killer_first = killers[0]
+        is_capture = board.is_capture
+        check_squares = self._check_squares(board, not board.turn)
+        piece_type_at = board.piece_type_at
+        center_bonus = self.CENTER_BONUS
 
         for move in moves:
             score = 0
@@ -953,33 +1368,33 @@ class PerfectChessEngine:
             if tt_move and move == tt_move:
                 score += 100000
 
-            if board.is_capture(move):
-                victim_val, attacker_val = self.get_capture_value(board, move)
-                score += 10000 + self.mvv_lva_score(victim_val, attacker_val)
+            if is_capture(move):
+                # An empty target square means en passant, capturing a pawn
+                victim = piece_type_at(move.to_square) or chess.PAWN
+                score += 10000 + MVV_LVA[(victim << 3) | piece_type_at(move.from_square)]
 
             # Killer moves
-            if ply < self.MAX_PLY:
-                killers = self.killer_moves[ply]
-                if move in killers:
-                    score += 9000 if move == killers[0] else 8000
+            if move in killers:
+                score += 9000 if move == killer_first else 8000
 
             if move.promotion:
                 score += 7000 + move.promotion * 100
 
-            score += self.history_table[color_idx][move.from_square][move.to_square]
+            score += history[color_base | (move.from_square << 6) | move.to_square]
 
-            if board.gives_check(move):
+            # Direct checks only; discovered checks are not worth a full gives_check()
+            checks = self._slider_check_squares(board, not board.turn, check_squares, move.from_square,
+                                                move.promotion or piece_type_at(move.from_square))
+            if chess.BB_SQUARES[move.to_square] & checks:
                 score += 50
 
             # Center control bonus
-            to_sq = move.to_square
-            center_dist = abs(3.5 - chess.square_file(to_sq)) + abs(3.5 - chess.square_rank(to_sq))
-            score += (7 - center_dist) * 10
+            score += center_bonus[move.to_square]
 
-            scored_moves.append((move, score))
+            scores[move] = score
 
-        scored_moves.sort(key=lambda x: x[1], reverse=True)
-        return [move for move, _ in scored_moves]
+        moves.sort(key=scores.__getitem__, reverse=True)
+        return moves
 
     def has_major_pieces(self, board: chess.Board) -> bool:
         """Check for null move pruning eligibility."""
@@ -998,7 +1413,7 @@ class PerfectChessEngine:
 
         # Reset search data
         self.killer_moves = [[None, None] for _ in range(self.MAX_PLY)]
-        self.history_table = [[[0 for _ in range(64)] for _ in range(64)] for _ in range(2)]
+        self.history_table = [0] * 8192
 
         print(f"{'='*70}")
         print(f"🔍 PERFECT ENGINE v7.2 - Iterative Deepening")
@@ -1044,6 +1459,13 @@ class PerfectChessEngine:
             iter_time = time.time() - iter_start
 
             if pv:
+                # A TT cutoff ends the search PV early; continue it from the table
+                if len(pv) < depth:
+                    temp_board = self.board.copy(stack=False)
+                    for move in pv:
+                        temp_board.push(move)
+                    pv = pv + self.tt.extract_pv(temp_board, depth - len(pv))
+
                 best_move = pv[0]
                 best_score = score
                 best_pv = pv
@@ -1059,7 +1481,7 @@ class PerfectChessEngine:
                     score_str = f"{display_score:+d}cp"
 
                 # PV as SAN
-                temp_board = self.board.copy()
+                temp_board = self.board.copy(stack=False)
                 pv_san = []
                 for move in pv[:8]:
                     pv_san.append(temp_board.san(move))
@@ -1088,7 +1510,7 @@ class PerfectChessEngine:
         print(f"TT hits: {self.tt_hits:,} ({self.tt_hits/max(self.nodes,1)*100:.1f}%)")
         print(f"Killer move hits: {self.killer_hits:,}")
         print(f"Null move prunes: {self.null_move_prunes:,}")
-        print(f"TT entries: {len(self.tt.table):,}")
+        print(f"TT entries: {len(self.tt):,}")
 
         # Tactical analysis
         our_color = chess.WHITE if self.play_as_white else chess.BLACK
@@ -1099,7 +1521,7 @@ class PerfectChessEngine:
         # Show full principal variation
         if best_pv:
             print(f"\nPrincipal Variation:")
-            temp_board = self.board.copy()
+            temp_board = self.board.copy(stack=False)
             move_num = 1
             line = ""
             for i, move in enumerate(best_pv[:12]):
@@ -1146,7 +1568,7 @@ class PerfectChessEngine:
             board_copy.push(move)
         
         # Show sequence with tactics
-        temp_board = self.board.copy()
+        temp_board = self.board.copy(stack=False)
         for i, (move, san, tactics) in enumerate(parsed_moves, 1):
             tactics_str = f" [{', '.join(tactics)}]" if tactics else ""
             print(f"  {i}. {san}{tactics_str}")
@@ -1176,36 +1598,45 @@ class PerfectChessEngine:
 
     def load_position(self, pos_input: str, play_as: Optional[str] = None):
         """Load position from FEN or PGN with full error handling."""
+        # Triage on the text itself first: a FEN's placement field has eight
+        # ranks, and PGN text opens with a tag pair. Neither needs a stat().
+        text = pos_input.lstrip()
+        if text.split(' ', 1)[0].count('/') == 7 and ' ' in text:
+            try:
+                self._load_fen(text, play_as)
+                return
+            except ValueError:
+                pass
+        is_pgn_text = text.startswith('[')
+
         # Try as file
-        if Path(pos_input).exists():
+        if not is_pgn_text and Path(pos_input).exists():
             try:
+                board = None
                 with open(pos_input, 'r') as f:
-                    content = f.read()
-
-                if content.strip().startswith('['):
-                    pgn = io.StringIO(content)
-                    game = chess.pgn.read_game(pgn)
-                    if game:
-                        board = game.board()
-                        for move in game.mainline_moves():
-                            board.push(move)
-                        self.board = board
-                        self.play_as_white = play_as.lower() in ['w', 'white'] if play_as else board.turn
-                        print(f"✓ Loaded position from PGN file")
-                        self._print_position_info("PGN file")
-                        return
+                    # PGN files open with a tag pair
+                    line = f.readline()
+                    while line and not line.strip():
+                        line = f.readline()
+                    if line.lstrip().startswith('['):
+                        f.seek(0)
+                        board = read_pgn_board(f)
+
+                if board is not None:
+                    self.board = board
+                    self.play_as_white = play_as.lower() in ['w', 'white'] if play_as else board.turn
+                    print(f"✓ Loaded position from PGN file")
+                    self._print_position_info("PGN file")
+                    return
             except Exception as e:
                 print(f"Warning: Failed to parse PGN file: {e}")
 
         # Try as PGN text
-        if '[' in pos_input or '1.' in pos_input:
+        if is_pgn_text or '[' in pos_input or '1.' in pos_input:
             try:
                 pgn = io.StringIO(pos_input)
-                game = chess.pgn.read_game(pgn)
-                if game:
-                    board = game.board()
-                    for move in game.mainline_moves():
-                        board.push(move)
+                board = read_pgn_board(pgn)
+                if board is not None:
                     self.board = board
                     self.play_as_white = play_as.lower() in ['w', 'white'] if play_as else board.turn
                     print(f"✓ Loaded position from PGN text")
@@ -1216,39 +1647,76 @@ class PerfectChessEngine:
 
         # Try as FEN
         try:
-            self.board.set_fen(pos_input)
-            self.play_as_white = play_as.lower() in ['w', 'white'] if play_as else self.board.turn
-            print(f"✓ Loaded position from FEN")
-            self._print_position_info("FEN")
+            self._load_fen(pos_input, play_as)
         except Exception as e:
             print(f"❌ Invalid FEN: {e}")
             raise ValueError(f"Could not parse position: {pos_input[:50]}...")
 
+    def _load_fen(self, fen: str, play_as: Optional[str]):
+        self.board.set_fen(fen)
+        self.play_as_white = play_as.lower() in ['w', 'white'] if play_as else self.board.turn
+        print(f"✓ Loaded position from FEN")
+        self._print_position_info("FEN")
+
     def _print_position_info(self, source: str):
-        print(f"\n{'='*70}")
-        print(f"Position loaded from: {source}")
-        print(f"Playing as: {'WHITE' if self.play_as_white else 'BLACK'}")
-        print(f"Side to move: {'WHITE' if self.board.turn else 'BLACK'}")
-        print(f"FEN: {self.board.fen()}")
-        print(f"Castling rights: {self.board.castling_rights}")
-        print(f"En passant: {chess.SQUARE_NAMES[self.board.ep_square] if self.board.ep_square else 'None'}")
-        print(f"Half-move clock: {self.board.halfmove_clock}")
-        print(f"Full-move number: {self.board.fullmove_number}")
-        print(f"{'='*70}\n")
-        print(self.board)
-        print()
+        if not self.verbose:
+            return
+        board = self.board
+        sys.stdout.write("\n".join((
+            f"\n{'='*70}",
+            f"Position loaded from: {source}",
+            f"Playing as: {'WHITE' if self.play_as_white else 'BLACK'}",
+            f"Side to move: {'WHITE' if board.turn else 'BLACK'}",
+            f"FEN: {board.fen()}",
+            f"Castling rights: {board.castling_rights}",
+            f"En passant: {chess.SQUARE_NAMES[board.ep_square] if board.ep_square else 'None'}",
+            f"Half-move clock: {board.halfmove_clock}",
+            f"Full-move number: {board.fullmove_number}",
+            f"{'='*70}\n",
+            str(board),
+            "",
+            "",
+        )))
 
 
 # ============================================================================
 # PARALLEL PROCESSING
 # ============================================================================
 
+# Best root score found so far, shared with the search worker processes
+_SHARED_ALPHA = None
+
+# Engine of a search worker process, built once and reused across tasks
+_WORKER_ENGINE = None
+
+
+def _init_search_worker(shared_alpha, tt_buffers):
+    """Pool initializer: build the worker's engine on the shared table and
+    bind the shared root alpha."""
+    global _SHARED_ALPHA, _WORKER_ENGINE
+    _SHARED_ALPHA = shared_alpha
+    _WORKER_ENGINE = PerfectChessEngine(num_workers=1, tt=SharedTranspositionTable(buffers=tt_buffers))
+
+
+def _worker_engine(time_limit: int) -> PerfectChessEngine:
+    """The worker's engine (a fresh one outside a pool), ready for a new task."""
+    engine = _WORKER_ENGINE if _WORKER_ENGINE is not None else PerfectChessEngine(num_workers=1)
+    engine.nodes = 0
+    engine.search_start_time = time.time()
+    engine.time_limit = time_limit
+    return engine
+
+
 def parallel_move_evaluator(args):
-    """Worker function for parallel root move evaluation."""
-    board_fen, move_uci, max_depth, time_limit = args
+    """Worker function for parallel root move evaluation.
+
+    The root move is searched against the best root score found so far, so
+    moves that cannot beat it fail low quickly.
+    """
+    raw_board, move_uci, max_depth, time_limit = args
     
-    engine = PerfectChessEngine(num_workers=1)
-    engine.board.set_fen(board_fen)
+    engine = _worker_engine(time_limit)
+    engine.board.set_raw(raw_board)
     
     # Make the move
     move = chess.Move.from_uci(move_uci)
@@ -1256,10 +1724,11 @@ def parallel_move_evaluator(args):
     
     # Search from opponent's perspective
     engine.play_as_white = not engine.board.turn
+    alpha = _SHARED_ALPHA.value if _SHARED_ALPHA is not None else -engine.MATE_SCORE
     
     # Run search
     score, pv = engine.negamax(engine.board, max_depth - 1, 
-                               -engine.MATE_SCORE, engine.MATE_SCORE, 0, True)
+                               -engine.MATE_SCORE, -alpha, 0, True)
     
     # Negate score since it's from opponent's perspective
     score = -score
@@ -1271,41 +1740,175 @@ def parallel_move_evaluator(args):
     }
 
 
+def lazy_smp_worker(args):
+    """Worker function for Lazy SMP: iterative deepening over the whole tree.
+
+    All workers share one transposition table. Helpers start from a
+    perturbed history table so their move ordering, and thus the parts of the
+    tree they reach first, differ; every other pair of helpers also searches
+    one ply deeper.
+    """
+    raw_board, max_depth, helper_id, time_limit = args
+
+    engine = _worker_engine(time_limit)
+    engine.board.set_raw(raw_board)
+    if helper_id:
+        rng = random.Random(helper_id)
+        engine.history_table = [rng.randrange(16) for _ in range(8192)]
+    else:
+        engine.history_table = [0] * 8192
+
+    target_depth = max_depth + ((helper_id >> 1) & 1)
+    completed_depth = 0
+    score, pv = 0, []
+    for depth in range(1, target_depth + 1):
+        iter_score, iter_pv = engine.negamax(engine.board, depth,
+                                             -engine.MATE_SCORE, engine.MATE_SCORE, 0, True)
+        # An iteration cut short by the clock is not trusted
+        if time.time() - engine.search_start_time > time_limit or not iter_pv:
+            break
+        completed_depth, score, pv = depth, iter_score, iter_pv
+
+    return {
+        'helper_id': helper_id,
+        'depth': completed_depth,
+        'score': score,
+        'pv': pv,
+        'nodes': engine.nodes
+    }
+
+
 class ParallelRootSearcher:
-    """Wrapper for parallel root move evaluation."""
+    """Wrapper for parallel root move evaluation.
+
+    The worker processes, the shared root alpha and the shared transposition
+    table live as long as the searcher, so repeated searches do not pay for
+    process start-up again. Call close() when done.
+    """
+
+    # Root candidates searched in the first stage of find_best_move_parallel
+    FIRST_BATCH = 8
+    # Widen to every legal move when the best first-stage score is below this
+    WIDEN_BELOW = -100
     
     def __init__(self, engine: PerfectChessEngine):
+        from concurrent.futures import ProcessPoolExecutor
+
         self.engine = engine
         self.num_workers = engine.num_workers
+        self.shared_alpha = Value('i', -engine.MATE_SCORE)
+        self.tt = SharedTranspositionTable()
+        self.executor = ProcessPoolExecutor(max_workers=self.num_workers, initializer=_init_search_worker,
+                                            initargs=(self.shared_alpha, self.tt.buffers))
+
+    def close(self):
+        """Shut down the worker processes."""
+        self.executor.shutdown()
     
     def find_best_move_parallel(self, max_depth: int = 8, time_limit: int = 30) -> Optional[str]:
         """Find best move using parallel root move evaluation."""
         print(f"🔄 Parallel root search with {self.num_workers} workers")
         
-        legal_moves = list(self.engine.board.legal_moves)
+        legal_moves = self._preorder_root_moves(time_limit)
         if not legal_moves:
             return None
         
         # Prepare arguments for workers
-        args_list = [(self.engine.board.fen(), move.uci(), max_depth, time_limit) 
-                    for move in legal_moves[:20]]  # Limit to 20 candidates
+        raw_board = self.engine.board.to_raw()
+        args_list = [(raw_board, move.uci(), max_depth, time_limit) 
+                    for move in legal_moves]
         
-        # Run parallel evaluation
-        with Pool(processes=self.num_workers) as pool:
-            results = pool.map(parallel_move_evaluator, args_list)
+        # Run parallel evaluation. The first move is searched alone to seed
+        # alpha; the rest stream back in completion order, each raising the
+        # shared alpha so later searches get a tighter window.
+        self.shared_alpha.value = -self.engine.MATE_SCORE
+        best_result = self.executor.submit(parallel_move_evaluator, args_list[0]).result()
+        self.shared_alpha.value = best_result['score']
+        
+        # Staged widening: the best pre-ordered candidates go first, and the
+        # rest are searched only if none of them holds the position
+        best_result = self._search_root_batch(args_list[1:self.FIRST_BATCH], best_result)
+        if best_result['score'] < self.WIDEN_BELOW:
+            best_result = self._search_root_batch(args_list[self.FIRST_BATCH:], best_result)
         
-        # Find best move
-        best_result = max(results, key=lambda x: x['score'])
         best_move = chess.Move.from_uci(best_result['move_uci'])
         
         return self.engine.board.san(best_move)
 
+    def _search_root_batch(self, args_list: List[tuple], best_result: Dict[str, Any]) -> Dict[str, Any]:
+        """Search root moves concurrently, raising the shared alpha as better
+        results stream back; returns the best result including best_result."""
+        from concurrent.futures import as_completed
+
+        futures = [self.executor.submit(parallel_move_evaluator, args) for args in args_list]
+        for future in as_completed(futures):
+            result = future.result()
+            if result['score'] > best_result['score']:
+                best_result = result
+                self.shared_alpha.value = result['score']
+        return best_result
+
+    def _preorder_root_moves(self, time_limit: int, depth: int = 2) -> List[chess.Move]:
+        """Root moves sorted best first by a shallow search in this process, so
+        the strongest candidates are dispatched in the first stage."""
+        engine = self.engine
+        board = engine.board
+        engine.search_start_time = time.time()
+        engine.time_limit = time_limit
+
+        scores = {}
+        for move in board.legal_moves:
+            board.push(move)
+            score, _ = engine.negamax(board, depth - 1, -engine.MATE_SCORE, engine.MATE_SCORE, 1, True)
+            board.pop()
+            scores[move] = -score
+
+        moves = list(scores)
+        moves.sort(key=scores.__getitem__, reverse=True)
+        return moves
+
+    def find_best_move_lazy_smp(self, max_depth: int = 8, time_limit: int = 30) -> Optional[str]:
+        """Find best move with Lazy SMP: every worker searches the full root."""
+        from concurrent.futures import as_completed
+
+        print(f"🔄 Lazy SMP search with {self.num_workers} workers")
+
+        if not any(self.engine.board.generate_legal_moves()):
+            return None
+
+        raw_board = self.engine.board.to_raw()
+        args_list = [(raw_board, max_depth, helper_id, time_limit) for helper_id in range(self.num_workers)]
+
+        # Workers cross-pollinate through the shared transposition table.
+        # Deepest completed search wins, then the longer PV, then the lower
+        # helper id (the main worker is unperturbed).
+        futures = [self.executor.submit(lazy_smp_worker, args) for args in args_list]
+        best_result = None
+        best_rank = None
+        nodes = 0
+        for future in as_completed(futures):
+            result = future.result()
+            nodes += result['nodes']
+            if not result['pv']:
+                continue
+            rank = (result['depth'], len(result['pv']), -result['helper_id'])
+            if best_rank is None or rank > best_rank:
+                best_result, best_rank = result, rank
+
+        if best_result is None:
+            return self.engine.board.san(next(iter(self.engine.board.legal_moves)))
+        print(f"Depth {best_result['depth']} | {best_result['score']:+d}cp | {nodes:,}n")
+
+        return self.engine.board.san(best_result['pv'][0])
+
 
 # ============================================================================
 # MAIN FUNCTION
 # ============================================================================
 
 def main():
+    import argparse
+
     parser = argparse.ArgumentParser(
         description='Chess Engine v7.2 - Perfect Final Version',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -1315,6 +1918,7 @@ Examples:
   python chess_engine_v7_2.py --pos "game.pgn" --as white
   python chess_engine_v7_2.py --pos "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1" --move "e4,e5,Nf3"
   python chess_engine_v7_2.py --pos "start" --time 60 --parallel
+  python chess_engine_v7_2.py --pos "start" --depth 6 --smp --workers 4
         """
     )
     
@@ -1331,20 +1935,20 @@ Examples:
                        help='Evaluate move sequence: "e4" or "e4,e5,Nf3"')
     parser.add_argument('--parallel', action='store_true',
                        help='Use parallel root move evaluation')
+    parser.add_argument('--smp', action='store_true',
+                       help='Use Lazy SMP (all workers search the full tree)')
     parser.add_argument('--workers', type=int, default=None,
                        help='Number of parallel workers')
+    parser.add_argument('--quiet', action='store_true',
+                       help='Do not print details of the loaded position')
     
     args = parser.parse_args()
     
-    print("""
-╔══════════════════════════════════════════════════════════════════╗
-║         CHESS ENGINE v7.2 - PERFECT FINAL                       ║
-║   TT • Tactics • PST • Mobility • Pawns • King Safety • PV      ║
-╚══════════════════════════════════════════════════════════════════╝
-    """)
+    sys.stdout.write(BANNER)
     
     # Create engine
     engine = PerfectChessEngine(num_workers=args.workers)
+    engine.verbose = not args.quiet
     
     # Handle special positions
     if args.pos.lower() == "start":
@@ -1363,9 +1967,15 @@ Examples:
     if args.move:
         engine.evaluate_move_sequence(args.move, depth=args.depth)
     else:
-        if args.parallel:
+        if args.smp or args.parallel:
             searcher = ParallelRootSearcher(engine)
-            best_move = searcher.find_best_move_parallel(max_depth=args.depth, time_limit=args.time)
+            try:
+                if args.smp:
+                    best_move = searcher.find_best_move_lazy_smp(max_depth=args.depth, time_limit=args.time)
+                else:
+                    best_move = searcher.find_best_move_parallel(max_depth=args.depth, time_limit=args.time)
+            finally:
+                searcher.close()
         else:
             best_move = engine.find_best_move(max_depth=args.depth, time_limit=args.time)
         
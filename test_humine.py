@@ -0,0 +1,124 @@
+import io
+
+import chess
+
+from humine import (TT_EXACT, TT_LOWER, TT_UPPER, PerfectChessEngine, SharedTranspositionTable, TacticsDetector,
+                    TranspositionTable, ZobristBoard, read_pgn_board, zobrist_hash)
+
+
+def _tactics(fen, uci):
+    board = ZobristBoard(fen)
+    return TacticsDetector.detect_all_tactics(board, chess.Move.from_uci(uci), board.turn)
+
+
+def _play_and_unwind(board, ucis):
+    hashes = []
+    for uci in ucis:
+        move = chess.Move.from_uci(uci)
+        assert not move or move in board.legal_moves
+        hashes.append(board.zobrist_hash)
+        board.push(move)
+        assert board.zobrist_hash == zobrist_hash(board)
+    copy = board.copy(stack=2)
+    assert copy.zobrist_hash == board.zobrist_hash
+    for expected in reversed(hashes[-2:]):
+        copy.pop()
+        assert copy.zobrist_hash == expected
+    while hashes:
+        board.pop()
+        assert board.zobrist_hash == hashes.pop() == zobrist_hash(board)
+
+
+def test_zobrist_push_pop_en_passant_promotion_castling_null():
+    # En passant, capture-promotion (taking castling rights), null move,
+    # castling both ways and a quiet promotion
+    board = ZobristBoard("r3k2r/1P6/8/3pP3/8/8/6p1/R3K2R w KQkq d6 0 1")
+    _play_and_unwind(board, ["e5d6", "g2h1n", "0000", "a8a2", "e1c1", "e8g8", "b7b8q"])
+
+
+def test_zobrist_push_pop_chess960_castling_and_en_passant():
+    board = ZobristBoard("1r2k1r1/pppppppp/8/8/8/8/PPPPPPPP/1R2K1R1 w GBgb - 0 1", chess960=True)
+    # Double pushes next to an enemy pawn hash the en passant file
+    _play_and_unwind(board, ["e1b1", "e8g8", "d2d4", "e7e5", "d4d5", "c7c5", "d5c6", "e5e4", "f2f4", "e4f3"])
+
+
+def test_raw_board_round_trip():
+    for fen in ["rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w KQkq f6 0 3",
+                "r3k2r/1P6/8/8/8/8/6p1/R3K2R b Kq - 7 41"]:
+        board = ZobristBoard(fen)
+        board.promoted |= chess.BB_B7
+        restored = ZobristBoard()
+        restored.set_raw(board.to_raw())
+        assert restored.fen() == board.fen()
+        assert restored.promoted == board.promoted
+        assert restored.zobrist_hash == board.zobrist_hash
+
+
+def test_shared_tt_round_trips_packed_entries():
+    table = SharedTranspositionTable(1 << 10)
+    entries = [
+        (0x1234_5678_9ABC_DEF0, 12, -31990, TT_UPPER, chess.Move(chess.A7, chess.A8, chess.QUEEN)),
+        (0x0FED_CBA9_8765_4321, 0, 31990, TT_LOWER, chess.Move(chess.H2, chess.H1, chess.KNIGHT)),
+        (0x0000_0000_0000_0402, 3, -1, TT_EXACT, None),
+    ]
+    for key, depth, score, flag, move in entries:
+        table.store(key, depth, score, flag, move)
+    for key, depth, score, flag, move in entries:
+        assert table._read(key & table.mask) == (key, depth, score, flag, move)
+    assert len(table) == len(entries)
+
+
+def test_tt_store_replacement_rule():
+    table = TranspositionTable(16)
+    key, other = 0x11, 0x21  # same slot
+    table.store(key, 5, 10, TT_EXACT, None)
+    table.store(key, 4, 20, TT_EXACT, None)  # same position, shallower: kept
+    assert table._read(1)[:3] == (key, 5, 10)
+    table.store(key, 5, 30, TT_EXACT, None)  # same position, as deep: replaced
+    assert table._read(1)[:3] == (key, 5, 30)
+    table.store(other, 2, 40, TT_EXACT, None)  # other position, 3 plies shallower: kept
+    assert table._read(1)[:3] == (key, 5, 30)
+    table.store(other, 3, 50, TT_EXACT, None)  # within REPLACE_MARGIN: evicted
+    assert table._read(1)[:3] == (other, 3, 50)
+    assert len(table) == 1
+
+
+def test_zobrist_hash_follows_mirror():
+    board = ZobristBoard("r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1")
+    mirrored = board.mirror()
+    assert mirrored.zobrist_hash == zobrist_hash(mirrored)
+    board.apply_mirror()
+    assert board.zobrist_hash == zobrist_hash(board)
+
+
+def test_discovered_attack_ignores_target_already_attacked_on_other_diagonal():
+    # Bc1 already hits a3; Nd2-f3 only opens the c1-h6 diagonal
+    assert "Discovered attack" not in _tactics("4k3/8/8/8/8/n7/3N4/2B1K3 w - - 0 1", "d2f3")
+
+
+def test_discovered_attack_ignores_target_already_attacked_on_other_file():
+    # Rh1 already hits h8; Ng1-f3 only opens the first rank
+    assert "Discovered attack" not in _tactics("4k2r/8/8/8/8/8/8/4K1NR w - - 0 1", "g1f3")
+
+
+def test_discovered_attack_on_opened_line():
+    assert "Discovered attack" in _tactics("4k3/8/8/8/8/4n3/3N4/2B1K3 w - - 0 1", "d2b3")
+
+
+def test_pgn_builder_keeps_mainline_up_to_illegal_move():
+    pgn = io.StringIO('[Event "t"]\n\n1. e4 e5 (1... c5 2. Nf3 (2. Nc3 Nc6) d6) 2. Nf3 Nc6 3. Qxh8 Nf6 *\n')
+    board = read_pgn_board(pgn)
+    assert board.fen() == "r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R w KQkq - 2 3"
+
+
+def test_trap_through_uncovered_slider():
+    # Nf3 uncovers Bh2, which takes b8 from the rook
+    assert "Traps rook" in _tactics("r1n5/pp6/8/4N2k/8/8/7B/6K1 w - - 0 1", "e5f3")
+
+
+def test_check_squares_cover_slider_retreating_along_king_line():
+    engine = PerfectChessEngine(num_workers=1)
+    board = ZobristBoard("k7/8/R7/8/8/8/8/7K w - - 0 1")
+    check_squares = engine._check_squares(board, chess.BLACK)
+    checks = engine._slider_check_squares(board, chess.BLACK, check_squares, chess.A6, chess.ROOK)
+    assert checks & chess.BB_A3